@@ -0,0 +1 @@
+"""Offline benchmark and load-test suite for the brain (run from apps/brain: python -m bench.run)"""
@@ -0,0 +1,147 @@
+"""Helpers shared by the stand-in servers and the load runner"""
+
+import asyncio
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+
+def parse_latency_map(spec: str) -> Dict[str, float]:
+    """'data=50,alarms=5' -> {"data": 0.05, "alarms": 0.005} (milliseconds in, seconds out)"""
+    mapping = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        key, _, value = item.partition("=")
+        mapping[key.strip()] = float(value) / 1000
+    return mapping
+
+
+async def simulated_delay(base: float, jitter: float):
+    """Sleep base seconds plus up to jitter seconds of uniform noise"""
+    delay = base + (random.uniform(0, jitter) if jitter else 0.0)
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+def summarize(latencies: List[float], duration: float = None) -> dict:
+    """Count, throughput and latency percentiles (milliseconds) for one scenario"""
+    summary = {"count": len(latencies)}
+    if duration:
+        summary["duration_s"] = round(duration, 3)
+        summary["throughput_per_s"] = round(len(latencies) / duration, 2)
+    if latencies:
+        ms = np.asarray(latencies) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        summary.update({
+            "mean_ms": round(float(ms.mean()), 2), "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2), "p99_ms": round(float(p99), 2), "max_ms": round(float(ms.max()), 2),
+        })
+    return summary
+
+
+_SAMPLE = re.compile(r'^(\w+)(?:\{(.*)\})? (\S+)$')
+
+
+def parse_prometheus(text: str) -> Dict[str, List[tuple]]:
+    """Samples from a /metrics body: {metric: [({label: value}, number), ...]}"""
+    samples: Dict[str, List[tuple]] = {}
+    for line in text.splitlines():
+        match = _SAMPLE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        label_map = dict(re.findall(r'(\w+)="([^"]*)"', labels or ""))
+        samples.setdefault(name, []).append((label_map, float(value)))
+    return samples
+
+
+def metrics_delta(before: Dict[str, List[tuple]], after: Dict[str, List[tuple]]) -> Dict[str, List[tuple]]:
+    """Counter/histogram samples accumulated between two scrapes"""
+    earlier = {(name, tuple(sorted(labels.items()))): value
+               for name, series in before.items() for labels, value in series}
+    return {name: [(labels, value - earlier.get((name, tuple(sorted(labels.items()))), 0.0))
+                   for labels, value in series]
+            for name, series in after.items()}
+
+
+def histogram_summary(samples: Dict[str, List[tuple]], name: str, **match: str) -> Optional[dict]:
+    """Count, mean and bucket-interpolated p50/p95/p99 (ms) of one histogram series"""
+    buckets = sorted(
+        (float("inf") if labels["le"] == "+Inf" else float(labels["le"]), count)
+        for labels, count in samples.get(f"{name}_bucket", [])
+        if all(labels.get(k) == v for k, v in match.items())
+    )
+    if not buckets or buckets[-1][1] == 0:
+        return None
+    total = buckets[-1][1]
+    seconds = sum(v for labels, v in samples.get(f"{name}_sum", []) if all(labels.get(k) == v for k, v in match.items()))
+
+    def quantile(q: float) -> float:
+        rank, lower, below = q * total, 0.0, 0.0
+        for bound, count in buckets:
+            if count >= rank:
+                if bound == float("inf"):
+                    return lower
+                return lower + (bound - lower) * ((rank - below) / (count - below) if count > below else 1.0)
+            lower, below = bound, count
+        return lower
+
+    return {"count": int(total), "mean_ms": round(seconds / total * 1000, 2),
+            **{f"p{int(q * 100)}_ms": round(quantile(q) * 1000, 2) for q in (0.5, 0.95, 0.99)}}
+
+
+class ServiceProcess:
+    """A server started as a child process (python -m ...), stopped with the run"""
+
+    def __init__(self, name: str, args: List[str], port: int, env: Dict[str, str] = None,
+                 health_path: str = "/", log_path: str = None):
+        self.name = name
+        self.args = args
+        self.port = port
+        self.env = {**os.environ, **(env or {})}
+        self.health_path = health_path
+        self.log_path = log_path
+        self.process: Optional[subprocess.Popen] = None
+        self._log = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self, timeout: float = 30.0):
+        self._close_log()
+        self._log = open(self.log_path, "ab") if self.log_path else None
+        self.process = subprocess.Popen([sys.executable, "-m"] + self.args, env=self.env,
+                                        stdout=self._log or subprocess.DEVNULL, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(timeout=2.0) as client:
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"{self.name} exited with code {self.process.returncode}")
+                try:
+                    await client.get(self.url + self.health_path)
+                    return
+                except httpx.HTTPError:
+                    await asyncio.sleep(0.2)
+        raise RuntimeError(f"{self.name} did not come up on port {self.port} within {timeout:g}s")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self._close_log()
+
+    def _close_log(self):
+        if self._log:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,155 @@
+"""OpenAI-compatible completion stand-in for offline benchmarks.
+
+Answers POST /v1/chat/completions (plain and streamed) from a script instead
+of a model. While the request offers tools and the latest user turn has no
+tool results yet, the first rule whose regex matches the user message
+decides which tool_calls to return. Calls to tools the request did not offer
+are left out. Once tool results are present, or no tools are offered (e.g.
+session summaries), the scripted answer is returned as text.
+
+A script is JSON:
+
+    {"rules": [{"match": "restart|fix", "tool_calls": [{"name": "propose_remediation",
+                "arguments": {"action_type": "restart_service", "target": "svc-{seq}",
+                              "description": "Restart svc-{seq}"}}]},
+               {"match": ".", "tool_calls": [{"name": "get_cpu_usage", "arguments": {}}]}],
+     "answer": "Checked {tools}. Everything is within normal range."}
+
+"{seq}" in string arguments becomes a per-process counter, so repeated
+proposals target different services. "{tools}" in the answer lists the tool
+results the request carried.
+
+    python -m bench.fake_llm --port 9100 --latency-ms 300 --tokens-per-second 400
+"""
+
+import argparse
+import itertools
+import json
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from bench.common import simulated_delay
+
+DEFAULT_SCRIPT = {
+    "rules": [
+        {"match": r"restart|fix|kill|remediate|clear",
+         "tool_calls": [{"name": "propose_remediation", "arguments": {
+             "action_type": "restart_service", "target": "svc-{seq}",
+             "description": "Restart svc-{seq} to release leaked memory",
+             "impact": "2-3 seconds downtime", "rollback_plan": "Start the previous unit", "severity": "MEDIUM"}}]},
+        {"match": r"diagnos|alert|alarm",
+         "tool_calls": [{"name": "diagnose_alert", "arguments": {"alert_name": "10min_cpu_usage"}}]},
+        {"match": r".",
+         "tool_calls": [{"name": "get_cpu_usage", "arguments": {}},
+                        {"name": "get_memory_usage", "arguments": {}},
+                        {"name": "get_load_average", "arguments": {}}]},
+    ],
+    "answer": "I checked {tools}. CPU, memory and load are within their normal ranges and "
+              "nothing needs attention right now.",
+}
+
+
+def _fill(value, seq: int):
+    if isinstance(value, str):
+        return value.replace("{seq}", str(seq))
+    if isinstance(value, dict):
+        return {k: _fill(v, seq) for k, v in value.items()}
+    return value
+
+
+def create_app(args) -> FastAPI:
+    app = FastAPI(title="Fake LLM")
+    script = DEFAULT_SCRIPT
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+    rules = [(re.compile(rule["match"], re.IGNORECASE), rule["tool_calls"]) for rule in script["rules"]]
+    counter = itertools.count(1)
+    latency, jitter = args.latency_ms / 1000, args.jitter_ms / 1000
+    app.state.requests = 0
+
+    def reply(body: dict) -> dict:
+        messages = body.get("messages", [])
+        last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+        tool_results = [m for m in messages[last_user + 1:] if m.get("role") == "tool"]
+        offered = {t["function"]["name"] for t in body.get("tools") or []}
+        if offered and not tool_results and last_user >= 0:
+            text = messages[last_user].get("content") or ""
+            for pattern, calls in rules:
+                if pattern.search(text):
+                    seq = next(counter)
+                    tool_calls = [
+                        {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                         "function": {"name": call["name"], "arguments": json.dumps(_fill(call["arguments"], seq))}}
+                        for call in calls if call["name"] in offered
+                    ]
+                    if tool_calls:
+                        return {"role": "assistant", "content": None, "tool_calls": tool_calls}
+                    break
+        names = ", ".join(m.get("name") or m.get("tool_call_id", "tool") for m in tool_results) or "the system"
+        return {"role": "assistant", "content": script["answer"].replace("{tools}", names)}
+
+    def usage(body: dict, message: dict) -> dict:
+        prompt = sum(len(str(m.get("content") or "")) for m in body.get("messages", [])) // 4
+        completion = len(json.dumps(message)) // 4
+        return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "bench-model", "object": "model", "owned_by": "bench"}]}
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        await simulated_delay(latency, jitter)
+        message = reply(body)
+        completion_id, created, model = f"chatcmpl-{uuid.uuid4().hex[:16]}", int(time.time()), body.get("model")
+        finish = "tool_calls" if message.get("tool_calls") else "stop"
+        if not body.get("stream"):
+            return {"id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                    "choices": [{"index": 0, "message": message, "finish_reason": finish}],
+                    "usage": usage(body, message)}
+
+        async def chunks():
+            def chunk(delta: dict, finish_reason=None) -> str:
+                return "data: " + json.dumps({
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}) + "\n\n"
+
+            if message.get("tool_calls"):
+                yield chunk({"role": "assistant", "tool_calls": [
+                    {"index": i, **call} for i, call in enumerate(message["tool_calls"])]})
+            else:
+                words = message["content"].split(" ")
+                for i, word in enumerate(words):
+                    if args.tokens_per_second:
+                        await simulated_delay(1 / args.tokens_per_second, 0)
+                    yield chunk({"content": word + (" " if i < len(words) - 1 else "")})
+            yield chunk({}, finish)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--script", help="JSON script of rules and answer (default: built-in)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="time before the first byte")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="stream pacing (0 = unpaced)")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
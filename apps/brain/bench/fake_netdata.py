@@ -0,0 +1,181 @@
+"""Netdata stand-in for offline benchmarks.
+
+Serves the parts of the Netdata v1 API the brain uses (/info, /data,
+/allmetrics, /alarms, /alarm_log, /charts) with synthetic random-walk
+metrics, a configurable set of raised alarms that can churn, and
+configurable response latency. Child hosts listed in --children are
+reported as mirrored_hosts and answer under /host/<name>/api/v1/..., like a
+Netdata parent, for fleet-mode runs.
+
+POST /eda accepts automation jobs, so approvals made during a benchmark do
+not fall back to running playbooks locally.
+
+    python -m bench.fake_netdata --port 19999 --latency-ms 20 --jitter-ms 10 --alarms 5
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from bench.common import parse_latency_map, simulated_delay
+
+CHARTS = {
+    "system.cpu": {"user": 20.0, "system": 8.0, "iowait": 2.0, "softirq": 1.0},
+    "system.ram": {"free": 2048.0, "used": 5120.0, "cached": 1024.0, "buffers": 256.0},
+    "system.load": {"load1": 1.2, "load5": 1.0, "load15": 0.8},
+    "system.io": {"in": 800.0, "out": -400.0},
+    "system.net": {"received": 1200.0, "sent": -900.0},
+    "apps.cpu": {"python": 12.0, "nginx": 4.0, "postgres": 6.0, "node": 3.0, "sshd": 0.1},
+    "apps.mem": {"python": 400.0, "nginx": 60.0, "postgres": 900.0, "node": 250.0, "sshd": 5.0},
+}
+
+ALARM_TEMPLATES = [
+    ("10min_cpu_usage", "system.cpu", "%", "average CPU utilization over the last 10 minutes"),
+    ("ram_in_use", "system.ram", "%", "system memory utilization"),
+    ("load_average_15", "system.load", "load", "system fifteen-minute load average"),
+    ("10min_disk_backlog", "disk.sda", "ms", "average backlog size of the disk"),
+    ("inbound_packets_dropped_ratio", "net.eth0", "%", "ratio of inbound dropped packets"),
+    ("tcp_connections", "ipv4.tcpsock", "connections", "IPv4 TCP connections utilization"),
+]
+
+
+class FakeNetdata:
+    """Synthetic metric and alarm state for one fake agent (and its children)"""
+
+    def __init__(self, hostname: str, children: List[str], alarms: int, seed: int):
+        self.hostname = hostname
+        self.children = children
+        self.random = random.Random(seed)
+        self.values = {chart: dict(dims) for chart, dims in CHARTS.items()}
+        self.alarms: Dict[str, dict] = {}
+        self.log: List[dict] = []
+        self.next_unique_id = 1
+        for i in range(alarms):
+            self.set_alarm(i, self.random.choice(["WARNING", "CRITICAL"]))
+
+    def step(self):
+        """Move every dimension one random-walk step"""
+        for dims in self.values.values():
+            for dim, value in dims.items():
+                dims[dim] = value + self.random.gauss(0, abs(value) * 0.05 + 0.1)
+
+    def rows(self, chart: str, points: int) -> dict:
+        dims = self.values.get(chart) or {"value": 0.0}
+        now = int(time.time())
+        rows = [[now - i] + [v + self.random.gauss(0, abs(v) * 0.02 + 0.01) for v in dims.values()]
+                for i in range(max(points, 1))]
+        return {"labels": ["time"] + list(dims), "data": rows}
+
+    def set_alarm(self, index: int, status: str):
+        name, chart, units, info = ALARM_TEMPLATES[index % len(ALARM_TEMPLATES)]
+        if index >= len(ALARM_TEMPLATES):
+            name = f"{name}_{index}"
+        alarm_id = index + 1
+        value = round(self.random.uniform(50, 99), 2)
+        now = int(time.time())
+        if status == "CLEAR":
+            self.alarms.pop(f"{chart}.{name}", None)
+        else:
+            self.alarms[f"{chart}.{name}"] = {
+                "id": alarm_id, "name": name, "chart": chart, "status": status, "value": value,
+                "units": units, "info": info, "last_status_change": now,
+            }
+        self.log.append({"unique_id": self.next_unique_id, "alarm_id": alarm_id, "name": name, "chart": chart,
+                         "status": status, "value": value, "units": units, "info": info, "when": now})
+        self.next_unique_id += 1
+        del self.log[:-1000]
+
+    def churn(self, alarm_slots: int):
+        """Raise, escalate or clear one random alarm"""
+        self.set_alarm(self.random.randrange(alarm_slots), self.random.choice(["WARNING", "CRITICAL", "CLEAR"]))
+
+
+def create_app(args) -> FastAPI:
+    app = FastAPI(title="Fake Netdata")
+    state = FakeNetdata(args.hostname, [c for c in args.children.split(",") if c], args.alarms, args.seed)
+    endpoint_latency = parse_latency_map(args.endpoint_latency)
+    base_latency, jitter = args.latency_ms / 1000, args.jitter_ms / 1000
+    app.state.netdata = state
+
+    async def delay(endpoint: str):
+        await simulated_delay(endpoint_latency.get(endpoint, base_latency), jitter)
+
+    async def info(host: str = None):
+        await delay("info")
+        body = {"hostname": host or state.hostname, "os_name": "Linux", "version": "v1.44.0-bench"}
+        if host is None:
+            body["mirrored_hosts"] = [state.hostname] + state.children
+        return body
+
+    async def data(chart: str, after: int = -1, points: int = 1, host: str = None):
+        await delay("data")
+        if chart not in state.values:
+            return JSONResponse({"error": f"chart {chart} not found"}, status_code=404)
+        return state.rows(chart, points)
+
+    async def allmetrics(host: str = None):
+        await delay("allmetrics")
+        return {chart: {"dimensions": {dim: {"name": dim, "value": value} for dim, value in dims.items()}}
+                for chart, dims in state.values.items()}
+
+    async def alarms(request: Request, host: str = None):
+        await delay("alarms")
+        return {"hostname": host or state.hostname, "alarms": state.alarms}
+
+    async def alarm_log(after: int = 0, host: str = None):
+        await delay("alarm_log")
+        return [entry for entry in state.log if entry["unique_id"] > after]
+
+    async def charts(host: str = None):
+        await delay("charts")
+        return {"charts": {chart: {"id": chart, "title": chart} for chart in state.values}}
+
+    for path, handler in [("/api/v1/info", info), ("/api/v1/data", data), ("/api/v1/allmetrics", allmetrics),
+                          ("/api/v1/alarms", alarms), ("/api/v1/alarm_log", alarm_log),
+                          ("/api/v1/charts", charts)]:
+        app.add_api_route(path, handler, methods=["GET"])
+        app.add_api_route("/host/{host}" + path, handler, methods=["GET"])
+
+    @app.post("/eda")
+    async def eda(request: Request):
+        await delay("eda")
+        return JSONResponse({"status": "accepted"}, status_code=202)
+
+    @app.on_event("startup")
+    async def start_churn():
+        async def loop():
+            while True:
+                await asyncio.sleep(1.0)
+                state.step()
+                for _ in range(args.alarm_churn):
+                    state.churn(max(args.alarms, 1) * 2)
+        app.state.churn_task = asyncio.create_task(loop())
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=19999)
+    parser.add_argument("--hostname", default="bench-node")
+    parser.add_argument("--children", default="", help="comma-separated child hosts to report as streamed")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform extra latency, 0..jitter")
+    parser.add_argument("--endpoint-latency", default="",
+                        help="per-endpoint latency in ms, e.g. data=50,alarms=5 (overrides --latency-ms)")
+    parser.add_argument("--alarms", type=int, default=3, help="alarms raised at start")
+    parser.add_argument("--alarm-churn", type=int, default=0, help="alarm transitions per second")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
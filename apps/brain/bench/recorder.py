@@ -0,0 +1,135 @@
+"""Record real Netdata/LLM traffic to a file and replay it offline.
+
+record: a pass-through proxy that forwards every request to --upstream and
+appends the request, response and upstream latency to a JSONL file. Point
+the brain's NETDATA_URL or CEREBRAS_BASE_URL at it and use the brain as
+usual. The upstream should be the bare origin, because paths are forwarded
+unchanged. Authorization headers are forwarded but never written out.
+
+replay: serves the recorded responses. A request gets the response recorded
+for the same method, path, query and body. Failing that, it gets one recorded
+for the same method, path and query, whatever the body (prompts that embed
+timestamps, for example). As a last resort it gets one recorded for the same
+method and path. Each fallback cycles through its recordings in their
+original order. Recorded latency is reproduced, scaled by --speed (0 =
+answer immediately).
+
+    python -m bench.recorder record --upstream https://api.cerebras.ai --file sessions/llm.jsonl --port 9100
+    CEREBRAS_BASE_URL=http://127.0.0.1:9100/v1 uvicorn main:app
+    python -m bench.recorder replay --file sessions/llm.jsonl --port 9100
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+HOP_HEADERS = {"host", "content-length", "connection", "transfer-encoding", "accept-encoding"}
+
+
+def request_keys(method: str, path: str, query: str, body: bytes) -> List[str]:
+    """Lookup keys for a request, most specific first; JSON bodies are compared with sorted keys"""
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True).encode() if body else b""
+    except ValueError:
+        pass
+    route = f"{method} {path}"
+    with_query = f"{route}?{'&'.join(sorted(query.split('&'))) if query else ''}"
+    return [f"{with_query} {hashlib.sha256(body).hexdigest()[:16]}", with_query, route]
+
+
+def create_record_app(upstream: str, path: str) -> FastAPI:
+    app = FastAPI(title="Bench recorder")
+    client = httpx.AsyncClient(base_url=upstream.rstrip("/"), timeout=120.0)
+    out = open(path, "a")
+
+    @app.api_route("/{target:path}", methods=["GET", "POST", "PUT", "DELETE"])
+    async def proxy(target: str, request: Request):
+        body = await request.body()
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_HEADERS}
+        start = time.perf_counter()
+        upstream_response = await client.request(request.method, "/" + target, params=request.url.query or None,
+                                                 content=body, headers=headers)
+        elapsed = time.perf_counter() - start
+        content_type = upstream_response.headers.get("content-type", "application/octet-stream")
+        out.write(json.dumps({
+            "keys": request_keys(request.method, "/" + target, request.url.query, body),
+            "method": request.method, "path": "/" + target, "query": request.url.query,
+            "body": body.decode(errors="replace"), "status": upstream_response.status_code,
+            "content_type": content_type, "response": upstream_response.text,
+            "elapsed_ms": round(elapsed * 1000, 2), "recorded_at": time.time(),
+        }) + "\n")
+        out.flush()
+        return Response(upstream_response.content, status_code=upstream_response.status_code,
+                        media_type=content_type)
+
+    @app.on_event("shutdown")
+    async def close():
+        await client.aclose()
+        out.close()
+
+    return app
+
+
+def load_recordings(path: str) -> List[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def create_replay_app(path: str, speed: float) -> FastAPI:
+    app = FastAPI(title="Bench replay")
+    tiers: List[Dict[str, List[dict]]] = [defaultdict(list) for _ in range(3)]
+    for entry in load_recordings(path):
+        for tier, key in zip(tiers, entry["keys"]):
+            tier[key].append(entry)
+    cycles = [{key: itertools.cycle(entries) for key, entries in tier.items()} for tier in tiers]
+    app.state.stats = {"exact": 0, "query": 0, "route": 0, "missing": 0}
+
+    @app.api_route("/{target:path}", methods=["GET", "POST", "PUT", "DELETE"])
+    async def replay(target: str, request: Request):
+        body = await request.body()
+        keys = request_keys(request.method, "/" + target, request.url.query, body)
+        for tier, cycle, key in zip(["exact", "query", "route"], cycles, keys):
+            if key in cycle:
+                entry = next(cycle[key])
+                app.state.stats[tier] += 1
+                break
+        else:
+            app.state.stats["missing"] += 1
+            return Response(json.dumps({"error": f"nothing recorded for {request.method} /{target}"}),
+                            status_code=404, media_type="application/json")
+        if speed:
+            await asyncio.sleep(entry["elapsed_ms"] / 1000 * speed)
+        return Response(entry["response"], status_code=entry["status"], media_type=entry["content_type"])
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--file", required=True, help="JSONL recording")
+    parser.add_argument("--upstream", help="origin to forward to (record mode)")
+    parser.add_argument("--speed", type=float, default=1.0, help="recorded latency multiplier (replay mode)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+    if args.mode == "record":
+        if not args.upstream:
+            parser.error("record mode needs --upstream")
+        app = create_record_app(args.upstream, args.file)
+    else:
+        app = create_replay_app(args.file, args.speed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
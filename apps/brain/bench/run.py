@@ -0,0 +1,424 @@
+"""Offline load scenarios for the brain, with a machine-readable report.
+
+Starts the Netdata and LLM stand-ins (or replays of recorded sessions, or
+real endpoints), starts the brain against them with uvicorn, and runs the
+selected scenarios one after another:
+
+    chat        /chat throughput over a mix of fast-path, LLM and cached questions
+    diagnose    end-to-end latency of chats that run diagnose_alert
+    approvals   approval storm: several approvers racing on every action, then one bulk call
+    audit       write rate of the audit writer (Postgres with --database-url, else the local journal)
+    ws          /ws fan-out: thousands of clients, delivery latency of every broadcast
+
+Each scenario reports client-side latency percentiles and throughput. It also
+reports the server-side histograms from /metrics that accumulated while it
+ran. The whole report is written as JSON.
+
+    cd apps/brain
+    python -m bench.run --scenarios chat,approvals --requests 500 --concurrency 50 --report bench_report.json
+    python -m bench.run --scenarios ws --ws-clients 5000 --ws-events 20
+    python -m bench.run --replay-llm sessions/llm.jsonl --replay-netdata sessions/netdata.jsonl
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import resource
+import socket
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from bench.common import ServiceProcess, histogram_summary, metrics_delta, parse_prometheus, summarize
+
+SCENARIOS = ["chat", "diagnose", "approvals", "audit", "ws"]
+
+CHAT_MESSAGES = [
+    "what is the cpu usage",
+    "why is the box slow right now #{i}",
+    "is anything wrong with memory",
+    "show me the load average",
+    "why did disk io jump #{i}",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def raise_fd_limit():
+    """Thousands of WebSocket clients need thousands of descriptors (children inherit the limit)"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def drive(count: int, concurrency: int, request: Callable[[int], Awaitable]) -> tuple:
+    """Run request(i) count times, at most concurrency at once; returns (latencies, results, errors, seconds)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, results, errors = [], [], Counter()
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                results.append(await request(i))
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors[type(e).__name__] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return latencies, results, dict(errors), time.perf_counter() - start
+
+
+class Bench:
+    """Shared state for one run: the brain's URL, an HTTP client and /metrics snapshots"""
+
+    def __init__(self, args, brain_url: str):
+        self.args = args
+        self.brain_url = brain_url
+        self.client = httpx.AsyncClient(base_url=brain_url, timeout=args.request_timeout,
+                                        limits=httpx.Limits(max_connections=max(args.concurrency, 10) * 2))
+
+    async def metrics(self) -> dict:
+        try:
+            response = await self.client.get("/metrics")
+            return parse_prometheus(response.text) if response.status_code == 200 else {}
+        except httpx.HTTPError:
+            return {}
+
+    async def chat(self, message: str) -> dict:
+        response = await self.client.post("/chat", json={"message": message})
+        response.raise_for_status()
+        return response.json()
+
+    async def pending_ids(self) -> List[str]:
+        response = await self.client.get("/pending-actions")
+        response.raise_for_status()
+        return [str(action["id"]) for action in response.json()["actions"]]
+
+    async def create_actions(self, count: int) -> List[str]:
+        """New pending actions via remediation chats (the stand-in LLM proposes one per chat)"""
+        existing = set(await self.pending_ids())
+        await drive(count, self.args.concurrency, lambda i: self.chat(f"please restart the leaking service #{i}"))
+        return [action_id for action_id in await self.pending_ids() if action_id not in existing]
+
+    # ------------------------------------------------------------------ scenarios
+
+    async def scenario_chat(self) -> dict:
+        messages = CHAT_MESSAGES
+        if self.args.chat_messages:
+            with open(self.args.chat_messages) as f:
+                messages = [line.strip() for line in f if line.strip()]
+        by_source: Dict[str, List[float]] = defaultdict(list)
+
+        async def request(i: int):
+            start = time.perf_counter()
+            body = await self.chat(messages[i % len(messages)].replace("{i}", str(i)))
+            by_source[body.get("served_by", "unknown")].append(time.perf_counter() - start)
+            return body
+
+        latencies, _, errors, seconds = await drive(self.args.requests, self.args.concurrency, request)
+        return {**summarize(latencies, seconds), "errors": errors,
+                "by_served_by": {source: summarize(values) for source, values in by_source.items()}}
+
+    async def scenario_diagnose(self) -> dict:
+        latencies, results, errors, seconds = await drive(
+            self.args.diagnose_requests, self.args.diagnose_concurrency,
+            lambda i: self.chat(f"diagnose the 10min_cpu_usage alert #{i}"))
+        ran = sum("diagnose_alert" in r.get("tools_used", []) for r in results)
+        return {**summarize(latencies, seconds), "errors": errors, "diagnose_alert_calls": ran}
+
+    async def scenario_approvals(self) -> dict:
+        ids = await self.create_actions(self.args.approvals)
+        statuses = Counter()
+        wins = Counter()
+
+        async def approve(i: int):
+            action_id = ids[i // self.args.approvers]
+            response = await self.client.post(f"/actions/{action_id}/approve", json={
+                "action_id": action_id, "decision": "approve", "approved_by": f"bench-{i % self.args.approvers}"})
+            statuses[response.status_code] += 1
+            if response.status_code == 200:
+                wins[action_id] += 1
+            return response.status_code
+
+        latencies, _, errors, seconds = await drive(len(ids) * self.args.approvers, self.args.concurrency, approve)
+
+        bulk_ids = await self.create_actions(min(self.args.approvals, 500))
+        start = time.perf_counter()
+        bulk = (await self.client.post("/actions/bulk", json={
+            "action_ids": bulk_ids, "decision": "reject", "approved_by": "bench"})).json()
+        bulk_seconds = time.perf_counter() - start
+        return {
+            "actions": len(ids), "approvers_per_action": self.args.approvers,
+            **summarize(latencies, seconds), "errors": errors,
+            "status_codes": {str(code): n for code, n in statuses.items()},
+            "double_approvals": sum(1 for n in wins.values() if n > 1),
+            "unapproved": len(ids) - len(wins),
+            "bulk": {"actions": len(bulk_ids), "resolved": len(bulk.get("resolved", [])),
+                     "latency_ms": round(bulk_seconds * 1000, 2)},
+        }
+
+    async def scenario_audit(self) -> dict:
+        """Drive the audit writer in this process (the brain's HTTP API has no bulk audit path)"""
+        os.environ["BRAIN_JOURNAL_PATH"] = os.path.join(self.args.workdir, "audit_bench_journal.sqlite3")
+        os.environ["DATABASE_URL"] = self.args.database_url or "postgresql://bench@127.0.0.1:1/bench"
+        import main as brain
+        if self.args.database_url:
+            await brain.init_db()
+        writer = brain.audit_writer
+        writer.start()
+        count = self.args.audit_events
+        start = time.perf_counter()
+        for i in range(count):
+            await brain.log_audit("BENCH", "bench", f"event {i}", {"i": i, "payload": "x" * 64})
+            if i % writer.batch_size == 0:
+                await asyncio.sleep(0)  # let the flush loop interleave, as it does in the service
+        enqueue_seconds = time.perf_counter() - start
+        await writer.close()
+        seconds = time.perf_counter() - start
+        stats = writer.stats()
+        stored = stats["written"] + stats["journaled"]
+        if brain.db_pool:
+            await brain.db_pool.close()
+        return {"target": "postgres" if self.args.database_url else "journal", "events": count,
+                "enqueue_per_s": round(count / enqueue_seconds, 2), "duration_s": round(seconds, 3),
+                "stored_per_s": round(stored / seconds, 2), **stats}
+
+    async def scenario_ws(self) -> dict:
+        import websockets  # ships with uvicorn[standard]
+
+        ids = await self.create_actions(self.args.ws_events)
+        ws_url = self.brain_url.replace("http", "ws", 1) + "/ws"
+        triggered: Dict[str, float] = {}
+        arrivals: Dict[str, List[float]] = defaultdict(list)
+        connect_latencies, connect_errors = [], Counter()
+        clients, readers = [], []
+
+        async def read(ws):
+            try:
+                async for text in ws:
+                    if '"actions_resolved"' not in text:
+                        continue
+                    now = time.perf_counter()
+                    for action_id in json.loads(text).get("action_ids", []):
+                        arrivals[action_id].append(now)
+            except Exception:
+                pass
+
+        async def connect(i: int):
+            start = time.perf_counter()
+            ws = await websockets.connect(ws_url, max_size=None, open_timeout=30)
+            connect_latencies.append(time.perf_counter() - start)
+            clients.append(ws)
+            readers.append(asyncio.create_task(read(ws)))
+
+        async def guarded_connect(i: int):
+            try:
+                await connect(i)
+            except Exception as e:
+                connect_errors[type(e).__name__] += 1
+
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(200)
+
+        async def limited(i: int):
+            async with semaphore:
+                await guarded_connect(i)
+
+        await asyncio.gather(*(limited(i) for i in range(self.args.ws_clients)))
+        connect_seconds = time.perf_counter() - start
+        await asyncio.sleep(1.0)  # let initial snapshots drain
+
+        for action_id in ids:
+            triggered[action_id] = time.perf_counter()
+            await self.client.post("/actions/bulk", json={"action_ids": [action_id], "decision": "reject",
+                                                          "approved_by": "bench"})
+            await asyncio.sleep(self.args.ws_event_interval)
+        await asyncio.sleep(self.args.ws_settle)
+
+        deliveries = [t - triggered[a] for a, times in arrivals.items() if a in triggered for t in times]
+        fanout = [max(times) - triggered[a] for a, times in arrivals.items() if a in triggered]
+        health = (await self.client.get("/health")).json()
+        for ws in clients:
+            await ws.close()
+        for task in readers:
+            task.cancel()
+        return {
+            "clients": len(clients), "connect_errors": dict(connect_errors),
+            "connect": summarize(connect_latencies, connect_seconds),
+            "events": len(ids), "expected_deliveries": len(ids) * len(clients), "delivered": len(deliveries),
+            "delivery": summarize(deliveries), "fanout_complete": summarize(fanout),
+            "evicted": health.get("websocket", {}).get("evicted"),
+        }
+
+
+SERVER_HISTOGRAMS = [
+    ("brain_llm_completion_seconds", "mode"), ("brain_tool_seconds", "tool"),
+    ("brain_netdata_request_seconds", "endpoint"), ("brain_db_pool_acquire_seconds", None),
+    ("brain_db_query_seconds", "statement"), ("brain_ws_broadcast_seconds", None),
+]
+
+
+def server_side(delta: dict) -> dict:
+    """Per-label summaries of the brain's histograms that moved during a scenario"""
+    report = {}
+    for name, label in SERVER_HISTOGRAMS:
+        for labels, count in delta.get(f"{name}_count", []):
+            if count <= 0:
+                continue
+            match = {label: labels[label]} if label else {}
+            summary = histogram_summary(delta, name, **match)
+            if summary:
+                report.setdefault(name, {})[labels.get(label, "all") if label else "all"] = summary
+    return report
+
+
+async def run(args) -> dict:
+    raise_fd_limit()
+    os.makedirs(args.workdir, exist_ok=True)
+    processes: List[ServiceProcess] = []
+
+    def service(name: str, module_args: List[str], health_path: str = "/", env: dict = None) -> ServiceProcess:
+        port = free_port()
+        process = ServiceProcess(name, module_args + ["--port", str(port)], port, env, health_path,
+                                 os.path.join(args.workdir, f"{name}.log"))
+        processes.append(process)
+        return process
+
+    try:
+        netdata_url, llm_url, eda_url = args.netdata_url, args.llm_url, None
+        if not netdata_url:
+            if args.replay_netdata:
+                netdata = service("netdata", ["bench.recorder", "replay", "--file", args.replay_netdata,
+                                              "--speed", str(args.replay_speed)], "/api/v1/info")
+            else:
+                netdata = service("netdata", ["bench.fake_netdata", "--latency-ms", str(args.netdata_latency_ms),
+                                              "--jitter-ms", str(args.netdata_jitter_ms),
+                                              "--alarms", str(args.alarms), "--alarm-churn", str(args.alarm_churn)],
+                                  "/api/v1/info")
+            await netdata.start()
+            netdata_url = netdata.url
+            if not args.replay_netdata:
+                eda_url = netdata.url + "/eda"
+        if not llm_url:
+            if args.replay_llm:
+                llm = service("llm", ["bench.recorder", "replay", "--file", args.replay_llm,
+                                      "--speed", str(args.replay_speed)], "/")
+            else:
+                llm = service("llm", ["bench.fake_llm", "--latency-ms", str(args.llm_latency_ms),
+                                      "--jitter-ms", str(args.llm_jitter_ms)] +
+                              (["--script", args.llm_script] if args.llm_script else []), "/v1/models")
+            await llm.start()
+            llm_url = llm.url + "/v1"
+
+        brain_url = args.brain_url
+        if not brain_url:
+            env = {
+                "NETDATA_URL": netdata_url, "CEREBRAS_BASE_URL": llm_url,
+                "CEREBRAS_API_KEY": os.getenv("CEREBRAS_API_KEY") if args.llm_url else "bench",
+                "DATABASE_URL": args.database_url or "postgresql://bench@127.0.0.1:1/bench",
+                "BRAIN_JOURNAL_PATH": os.path.join(args.workdir, "brain_journal.sqlite3"),
+            }
+            if eda_url:
+                env["ANSIBLE_EDA_URL"] = eda_url
+            env.update(dict(item.split("=", 1) for item in args.brain_env))
+            brain = service("brain", ["uvicorn", "main:app", "--host", "127.0.0.1", "--log-level", "warning"],
+                            "/health", env)
+            await brain.start(timeout=60)
+            brain_url = brain.url
+
+        bench = Bench(args, brain_url)
+        report = {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "environment": {"python": sys.version.split()[0], "platform": platform.platform(),
+                            "cpus": os.cpu_count()},
+            "config": {k: v for k, v in vars(args).items() if k != "brain_env"},
+            "targets": {"brain": brain_url, "netdata": netdata_url, "llm": llm_url},
+            "scenarios": {},
+        }
+        for name in args.scenarios.split(","):
+            name = name.strip()
+            print(f"▶ {name}", file=sys.stderr)
+            before = await bench.metrics()
+            try:
+                with contextlib.redirect_stdout(sys.stderr):  # the in-process audit run imports main, which prints
+                    result = await getattr(bench, f"scenario_{name}")()
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            if name != "audit":
+                result["server"] = server_side(metrics_delta(before, await bench.metrics()))
+            report["scenarios"][name] = result
+            print(f"  {json.dumps({k: v for k, v in result.items() if not isinstance(v, dict)})}", file=sys.stderr)
+        await bench.client.aclose()
+        return report
+    finally:
+        for process in reversed(processes):
+            process.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="chat,diagnose,approvals,audit,ws",
+                        help=f"comma-separated, from {', '.join(SCENARIOS)}")
+    parser.add_argument("--report", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), f"brain-bench-{uuid.uuid4().hex[:8]}"),
+                        help="logs and journals of the run")
+    parser.add_argument("--requests", type=int, default=300, help="chat scenario requests")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--chat-messages", help="file of chat messages, one per line ({i} = request number)")
+    parser.add_argument("--diagnose-requests", type=int, default=50)
+    parser.add_argument("--diagnose-concurrency", type=int, default=4)
+    parser.add_argument("--approvals", type=int, default=200, help="actions in the approval storm")
+    parser.add_argument("--approvers", type=int, default=3, help="concurrent approvers per action")
+    parser.add_argument("--audit-events", type=int, default=50000)
+    parser.add_argument("--ws-clients", type=int, default=2000)
+    parser.add_argument("--ws-events", type=int, default=20)
+    parser.add_argument("--ws-event-interval", type=float, default=0.2)
+    parser.add_argument("--ws-settle", type=float, default=3.0, help="seconds to wait for the last deliveries")
+    parser.add_argument("--netdata-latency-ms", type=float, default=5.0)
+    parser.add_argument("--netdata-jitter-ms", type=float, default=5.0)
+    parser.add_argument("--alarms", type=int, default=3)
+    parser.add_argument("--alarm-churn", type=int, default=0)
+    parser.add_argument("--llm-latency-ms", type=float, default=250.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--llm-script", help="fake LLM script (see bench.fake_llm)")
+    parser.add_argument("--replay-netdata", help="serve Netdata from a recording (see bench.recorder)")
+    parser.add_argument("--replay-llm", help="serve the LLM from a recording (see bench.recorder)")
+    parser.add_argument("--replay-speed", type=float, default=1.0)
+    parser.add_argument("--netdata-url", help="use this Netdata instead of a stand-in")
+    parser.add_argument("--llm-url", help="use this OpenAI-compatible base URL (with CEREBRAS_API_KEY)")
+    parser.add_argument("--brain-url", help="benchmark an already running brain instead of starting one")
+    parser.add_argument("--database-url", help="Postgres for the brain and the audit scenario (default: memory mode)")
+    parser.add_argument("--brain-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the brain, e.g. --brain-env ROUTER_ENABLED=false")
+    args = parser.parse_args()
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(text + "\n")
+        print(f"Report written to {args.report} (logs in {args.workdir})", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
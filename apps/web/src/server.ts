@@ -29,10 +29,20 @@ app.get('/api/charts', async (c) => {
 })
 
 // API: Get specific chart data with history
+// Goes through the Brain's metric cache so polling dashboards share one Netdata query;
+// falls back to Netdata directly when the Brain is not running
 app.get('/api/chart/:chart', async (c) => {
   const chart = c.req.param('chart')
   const after = c.req.query('after') || '-60'
   const points = c.req.query('points') || '60'
+  try {
+    const response = await fetch(`http://localhost:8000/netdata/chart/${chart}?after=${after}&points=${points}`)
+    if (response.ok) {
+      return c.json(await response.json())
+    }
+  } catch (error) {
+    // Brain unavailable - query Netdata directly below
+  }
   try {
     const response = await fetch(`http://localhost:19999/api/v1/data?chart=${chart}&after=${after}&points=${points}&format=json`)
     const data = await response.json()
@@ -42,8 +52,17 @@ app.get('/api/chart/:chart', async (c) => {
   }
 })
 
-// API: Get active alerts from Netdata
+// API: Get active alerts
+// Served from the Brain's alarm-log-driven map; falls back to Netdata directly when the Brain is not running
 app.get('/api/alerts', async (c) => {
+  try {
+    const response = await fetch('http://localhost:8000/alerts')
+    if (response.ok) {
+      return c.json(await response.json())
+    }
+  } catch (error) {
+    // Brain unavailable - query Netdata directly below
+  }
   try {
     const response = await fetch('http://localhost:19999/api/v1/alarms?active')
     const data = await response.json()
@@ -68,12 +87,13 @@ app.get('/api/info', async (c) => {
 app.post('/api/chat', async (c) => {
   const body = await c.req.json()
   const message = body.message
+  const session_id = body.session_id
 
   try {
     const response = await fetch('http://localhost:8000/chat', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ message })
+      body: JSON.stringify({ message, session_id })
     })
     const data = await response.json()
     return c.json(data)
@@ -83,9 +103,20 @@ app.post('/api/chat', async (c) => {
 })
 
 // API: Get pending actions (HITL)
+// Passes the ETag through so unchanged polls are answered with 304 and cost the Brain almost nothing
 app.get('/api/pending-actions', async (c) => {
   try {
-    const response = await fetch('http://localhost:8000/pending-actions')
+    const ifNoneMatch = c.req.header('If-None-Match')
+    const response = await fetch('http://localhost:8000/pending-actions', {
+      headers: ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : {}
+    })
+    const etag = response.headers.get('ETag')
+    if (etag) {
+      c.header('ETag', etag)
+    }
+    if (response.status === 304) {
+      return c.body(null, 304)
+    }
     const data = await response.json()
     return c.json(data)
   } catch (error) {
@@ -105,12 +136,30 @@ app.post('/api/actions/:id/approve', async (c) => {
       body: JSON.stringify(body)
     })
     const data = await response.json()
-    return c.json(data)
+    // 409 = someone else already resolved it; let the UI say so
+    return c.json(data, response.status as any)
   } catch (error) {
     return c.json({ error: 'Failed to process approval' }, 500)
   }
 })
 
+// API: Approve/Reject many actions at once
+app.post('/api/actions/bulk', async (c) => {
+  const body = await c.req.json()
+
+  try {
+    const response = await fetch('http://localhost:8000/actions/bulk', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body)
+    })
+    const data = await response.json()
+    return c.json(data, response.status as any)
+  } catch (error) {
+    return c.json({ error: 'Failed to process approvals' }, 500)
+  }
+})
+
 // API: Get audit log
 app.get('/api/audit-log', async (c) => {
   try {
@@ -1449,6 +1498,9 @@ const dashboardHTML = `<!DOCTYPE html>
       chatInput.focus();
     }
 
+    // Follow-up questions continue the same Brain session
+    let chatSessionId = null;
+
     async function sendMessage() {
       const text = chatInput.value.trim();
       if (!text) return;
@@ -1463,10 +1515,11 @@ const dashboardHTML = `<!DOCTYPE html>
         const res = await fetch('/api/chat', {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ message: text })
+          body: JSON.stringify({ message: text, session_id: chatSessionId })
         });
         const data = await res.json();
         removeTyping(typingId);
+        if (data.session_id) chatSessionId = data.session_id;
         
         let content = data.response || 'No response';
         if (data.tools_used?.length > 0) {
@@ -1599,6 +1652,11 @@ const dashboardHTML = `<!DOCTYPE html>
           body: JSON.stringify({ action_id: actionId, decision: 'approve', approved_by: 'admin' })
         });
         const data = await res.json();
+        if (!res.ok) {
+          addChatMessage('⚠️ ' + (data.detail || 'Approval failed'), false);
+          refreshPendingActions();
+          return;
+        }
         
         // Show success notification
         addChatMessage('✅ Action approved: ' + data.message, false);
@@ -1619,6 +1677,11 @@ const dashboardHTML = `<!DOCTYPE html>
           body: JSON.stringify({ action_id: actionId, decision: 'reject', approved_by: 'admin' })
         });
         const data = await res.json();
+        if (!res.ok) {
+          addChatMessage('⚠️ ' + (data.detail || 'Rejection failed'), false);
+          refreshPendingActions();
+          return;
+        }
         
         addChatMessage('❌ Action rejected: ' + data.message, false);
         document.getElementById('chatPanel').style.display = 'flex';
@@ -1639,8 +1702,10 @@ const dashboardHTML = `<!DOCTYPE html>
             refreshPendingActions();
             // Flash notification
             document.getElementById('pendingCount').style.animation = 'pulse 0.5s 3';
-          } else if (data.type === 'action_resolved') {
+          } else if (data.type === 'action_resolved' || data.type === 'actions_resolved') {
             refreshPendingActions();
+          } else if (data.type === 'alarm_transition') {
+            fetchAlerts();
           }
         };
         ws.onclose = () => setTimeout(connectWebSocket, 3000);
@@ -1703,7 +1768,7 @@ const dashboardHTML = `<!DOCTYPE html>
     refreshAll();
     mainLoop();
     setInterval(mainLoop, 1000);
-    setInterval(fetchAlerts, 5000);
+    setInterval(fetchAlerts, 30000);  // alarm changes arrive over the WebSocket; this is a safety net
     setInterval(fetchProcesses, 3000);
   </script>
 </body>